@@ -1,5 +1,11 @@
 from scrapy_impersonate.handler import ImpersonateDownloadHandler
 from scrapy_impersonate.middleware import RandomBrowserMiddleware
 from scrapy_impersonate.parser import RequestParser
+from scrapy_impersonate.throttle import ImpersonateAutoThrottle
 
-__all__ = ["RequestParser", "ImpersonateDownloadHandler", "RandomBrowserMiddleware"]
+__all__ = [
+    "RequestParser",
+    "ImpersonateDownloadHandler",
+    "RandomBrowserMiddleware",
+    "ImpersonateAutoThrottle",
+]
@@ -1,7 +1,12 @@
 import time
-from typing import Type, TypeVar
+import zlib
+from itertools import cycle
+from typing import List, Optional, Type, TypeVar, Union
 
+from curl_cffi import CurlInfo
+from curl_cffi.curl import CURL_WRITEFUNC_ERROR
 from curl_cffi.requests import AsyncSession
+from curl_cffi.requests.exceptions import RequestException
 from scrapy.core.downloader.handlers.http11 import (
     HTTP11DownloadHandler as HTTPDownloadHandler,
 )
@@ -10,6 +15,7 @@ from scrapy.http.headers import Headers
 from scrapy.http.request import Request
 from scrapy.http.response import Response
 from scrapy.responsetypes import responsetypes
+from scrapy.utils.httpobj import urlparse_cached
 from scrapy.utils.reactor import verify_installed_reactor
 
 from scrapy_impersonate.parser import CurlOptionsParser, RequestParser
@@ -17,12 +23,97 @@ from scrapy_impersonate.parser import CurlOptionsParser, RequestParser
 ImpersonateHandler = TypeVar("ImpersonateHandler", bound="ImpersonateDownloadHandler")
 
 
+class PartialBody:
+    """Collects the response body and aborts the transfer once enough has been read.
+
+    Configured through the ``impersonate_partial`` meta key, the transfer stops after
+    ``max_bytes`` bytes or right after the first occurrence of ``delimiter``.
+    """
+
+    def __init__(
+        self, max_bytes: Optional[int] = None, delimiter: Optional[Union[str, bytes]] = None
+    ) -> None:
+        if isinstance(delimiter, str):
+            delimiter = delimiter.encode()
+
+        self.max_bytes = max_bytes
+        self.delimiter = delimiter
+        self.truncated = False
+        self._done = False
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self._tail = b""
+
+    @classmethod
+    def from_request(cls, request: Request) -> Optional["PartialBody"]:
+        partial = request.meta.get("impersonate_partial")
+        if not partial:
+            return None
+
+        max_bytes = partial.get("max_bytes")
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes <= 0):
+            raise ValueError(f"max_bytes must be a positive integer: {max_bytes!r}")
+
+        if partial.get("range") and max_bytes is None:
+            raise ValueError("range requires max_bytes")
+
+        delimiter = partial.get("delimiter")
+        if delimiter is not None and not isinstance(delimiter, (str, bytes)):
+            raise ValueError(f"delimiter must be str or bytes: {delimiter!r}")
+
+        return cls(max_bytes=max_bytes, delimiter=delimiter)
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(self._chunks)
+
+    def write(self, chunk: bytes) -> int:
+        if self._done:
+            # Data after the delimiter, so the body really is cut short
+            self.truncated = True
+            return CURL_WRITEFUNC_ERROR
+
+        end = None
+
+        if self.delimiter:
+            # Keep the end of the previous chunk, the delimiter may span both
+            window = self._tail + chunk
+            index = window.find(self.delimiter)
+            if index != -1:
+                end = index + len(self.delimiter) - len(self._tail)
+            self._tail = window[max(0, len(window) - len(self.delimiter) + 1) :]
+
+        if self.max_bytes is not None and self._size + len(chunk) > self.max_bytes:
+            remaining = self.max_bytes - self._size
+            end = remaining if end is None else min(end, remaining)
+
+        self._chunks.append(chunk if end is None else chunk[:end])
+        self._size += len(self._chunks[-1])
+
+        if end is None:
+            return len(chunk)
+
+        if end >= len(chunk):
+            # The delimiter ends the chunk, only abort if more data follows
+            self._done = True
+            return len(chunk)
+
+        self.truncated = True
+        return CURL_WRITEFUNC_ERROR
+
+
 class ImpersonateDownloadHandler(HTTPDownloadHandler):
     def __init__(self, crawler) -> None:
         super().__init__(crawler=crawler)
 
         verify_installed_reactor("twisted.internet.asyncioreactor.AsyncioSelectorReactor")
 
+        self.stats = crawler.stats
+
+        self._interfaces = crawler.settings.getlist("IMPERSONATE_INTERFACES")
+        self._interfaces_cycle = cycle(self._interfaces)
+        self._interfaces_sticky = crawler.settings.getbool("IMPERSONATE_INTERFACES_STICKY")
+
     @classmethod
     def from_crawler(cls: Type[ImpersonateHandler], crawler: Crawler) -> ImpersonateHandler:
         return cls(crawler)
@@ -32,36 +123,85 @@ class ImpersonateDownloadHandler(HTTPDownloadHandler):
             return await self._download_request(request)
         return await super().download_request(request)
 
+    def _get_interface(self, request: Request) -> Optional[str]:
+        """Pick the next local address or interface from IMPERSONATE_INTERFACES"""
+
+        if not self._interfaces:
+            return None
+
+        if not self._interfaces_sticky:
+            return next(self._interfaces_cycle)
+
+        # A stable hash keeps each domain on the same address without storing it
+        domain = urlparse_cached(request).hostname or ""
+        return self._interfaces[zlib.crc32(domain.encode()) % len(self._interfaces)]
+
     async def _download_request(self, request: Request) -> Response:
         # Work on a copy so CurlOptionsParser (which pops headers) does not mutate
         # the original request, and so those popped headers (e.g. Proxy-Authorization)
         # are not sent to the target server by RequestParser.
         request_copy = request.copy()
         curl_options = CurlOptionsParser(request_copy).as_dict()
+        partial_body = PartialBody.from_request(request_copy)
 
-        async with AsyncSession(max_clients=1, curl_options=curl_options) as client:
+        # Connection setup time and time to first byte, see ImpersonateAutoThrottle
+        curl_infos = [CurlInfo.PRETRANSFER_TIME, CurlInfo.STARTTRANSFER_TIME]
+
+        async with AsyncSession(
+            max_clients=1, curl_options=curl_options, curl_infos=curl_infos
+        ) as client:
             request_args = RequestParser(request_copy).as_dict()
+            if partial_body is not None:
+                request_args["content_callback"] = partial_body.write
+
+            # An interface set through impersonate_args takes precedence
+            if "interface" not in request_args:
+                request_args["interface"] = self._get_interface(request)
+            interface = request_args["interface"]
+
+            if interface is not None:
+                self.stats.inc_value(f"impersonate/interface/{interface}/request_count")
+
             start_time = time.time()
-            response = await client.request(**request_args)
+            try:
+                response = await client.request(**request_args)
+            except RequestException as e:
+                # Aborting the transfer on purpose surfaces as a write error
+                if partial_body is None or not partial_body.truncated or e.response is None:
+                    if interface is not None:
+                        self.stats.inc_value(f"impersonate/interface/{interface}/error_count")
+                    raise
+                response = e.response
             download_latency = time.time() - start_time
 
+        body = response.content if partial_body is None else partial_body.body
+        flags = ["impersonate"]
+        if partial_body is not None and (partial_body.truncated or response.status_code == 206):
+            flags.append("partial")
+
         headers = Headers(response.headers.multi_items())
         headers.pop("Content-Encoding", None)
+        if partial_body is not None and partial_body.truncated:
+            headers["Content-Length"] = str(len(body))
 
         respcls = responsetypes.from_args(
             headers=headers,
             url=response.url,
-            body=response.content,
+            body=body,
         )
 
         resp = respcls(
             url=response.url,
             status=response.status_code,
             headers=headers,
-            body=response.content,
-            flags=["impersonate"],
+            body=body,
+            flags=flags,
             request=request,
         )
 
         resp.meta["download_latency"] = download_latency
+
+        # Unlike download_latency, these leave out the body transfer
+        resp.meta["impersonate_connect_time"] = response.infos[CurlInfo.PRETRANSFER_TIME]
+        resp.meta["impersonate_ttfb"] = response.infos[CurlInfo.STARTTRANSFER_TIME]
         return resp
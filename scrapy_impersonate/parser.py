@@ -84,8 +84,15 @@ class RequestParser:
 
     @property
     def headers(self) -> dict:
-        headers = self._request.headers.to_unicode_dict()
-        return dict(headers)
+        headers = dict(self._request.headers.to_unicode_dict())
+
+        # Ask the server for the first bytes only, unless a Range was set explicitly
+        # Validated by PartialBody.from_request
+        partial = self._request.meta.get("impersonate_partial") or {}
+        if partial.get("range") and partial.get("max_bytes"):
+            headers.setdefault("Range", f"bytes=0-{partial['max_bytes'] - 1}")
+
+        return headers
 
     @property
     def cookies(self) -> dict:
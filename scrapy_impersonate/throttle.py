@@ -0,0 +1,139 @@
+import inspect
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from scrapy.core.downloader import Slot
+from scrapy.extensions.throttle import AutoThrottle
+from scrapy.http.response import Response
+
+
+class ImpersonateAutoThrottle(AutoThrottle):
+    """AutoThrottle driven by server-side latency instead of wall-clock latency.
+
+    For impersonated requests the delay is computed from the time between the request
+    being sent and the first response byte, leaving out connection setup (including a
+    proxy CONNECT and the TLS handshake) and the body transfer.
+
+    On ``429`` responses, or ``503`` responses with a ``Retry-After`` header, the slot
+    backs off straight away: the delay is doubled, to at least
+    ``AUTOTHROTTLE_START_DELAY`` or ``Retry-After``, and the slot concurrency is
+    halved. Rate-limited responses to requests sent before the last back off belong to
+    the same event and are ignored. Until the new delay (or ``Retry-After``) has passed
+    the delay is not lowered; after that concurrency grows back by one request on every
+    ``200`` response.
+    """
+
+    def __init__(self, crawler) -> None:
+        super().__init__(crawler)
+
+        # Only slots that are backed off or still recovering have an entry
+        self._backoffs: Dict[str, _SlotBackOff] = {}
+
+    def _adjust_delay(self, slot: Slot, latency: float, response: Response) -> None:
+        key = response.meta["download_slot"]
+        now = time.time()
+
+        backoff = self._backoffs.get(key)
+        if backoff is not None and backoff.slot is not slot:
+            # Scrapy dropped the slot while idle and built a new one
+            del self._backoffs[key]
+            backoff = None
+
+        if self._is_rate_limited(response):
+            sent_at = now - response.meta.get("download_latency", 0.0)
+            if backoff is None or sent_at >= backoff.backed_off_at:
+                self._back_off(key, slot, response, now)
+            return
+
+        server_latency = self._server_latency(response)
+        if server_latency is not None:
+            latency = server_latency
+
+        if backoff is None:
+            super()._adjust_delay(slot, latency, response)
+            return
+
+        if now < backoff.hold_until:
+            delay = slot.delay
+            super()._adjust_delay(slot, latency, response)
+            slot.delay = max(delay, slot.delay)
+            return
+
+        super()._adjust_delay(slot, latency, response)
+
+        if response.status == 200 and slot.concurrency < backoff.concurrency:
+            slot.concurrency += 1
+        if slot.concurrency >= backoff.concurrency:
+            del self._backoffs[key]
+
+    def _back_off(self, key: str, slot: Slot, response: Response, now: float) -> None:
+        self._prune_backoffs()
+
+        backoff = self._backoffs.get(key)
+        if backoff is None:
+            backoff = self._backoffs[key] = _SlotBackOff(slot)
+
+        start_delay = self._back_off_start_delay()
+        retry_after = min(self._retry_after(response) or 0.0, self.maxdelay)
+
+        slot.delay = min(max(slot.delay * 2, start_delay, retry_after), self.maxdelay)
+        slot.concurrency = max(1, slot.concurrency // 2)
+
+        backoff.backed_off_at = now
+        backoff.hold_until = now + max(slot.delay, retry_after)
+
+    def _back_off_start_delay(self) -> float:
+        # Older Scrapy versions pass the spider to the delay helpers
+        if "spider" in inspect.signature(self._start_delay).parameters:
+            return self._start_delay(self.crawler.spider)  # type: ignore[call-arg]
+        return self._start_delay()
+
+    def _prune_backoffs(self) -> None:
+        """Forget slots that Scrapy dropped or replaced since they backed off"""
+
+        slots = self.crawler.engine.downloader.slots
+        for key, backoff in list(self._backoffs.items()):
+            if slots.get(key) is not backoff.slot:
+                del self._backoffs[key]
+
+    @staticmethod
+    def _is_rate_limited(response: Response) -> bool:
+        if response.status == 429:
+            return True
+        return response.status == 503 and b"Retry-After" in response.headers
+
+    @staticmethod
+    def _server_latency(response: Response) -> Optional[float]:
+        connect_time = response.meta.get("impersonate_connect_time")
+        ttfb = response.meta.get("impersonate_ttfb")
+        if connect_time is None or ttfb is None:
+            return None
+
+        return max(0.0, ttfb - connect_time)
+
+    @staticmethod
+    def _retry_after(response: Response) -> Optional[float]:
+        value = response.headers.get(b"Retry-After")
+        if not value:
+            return None
+
+        value = value.decode("latin-1").strip()
+        if value.isdigit():
+            return float(value)
+
+        try:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+
+
+class _SlotBackOff:
+    """Back off state of a downloader slot"""
+
+    def __init__(self, slot: Slot) -> None:
+        self.slot = slot
+        # Slot concurrency before the back off, to grow back to
+        self.concurrency = slot.concurrency
+        self.backed_off_at = 0.0
+        self.hold_until = 0.0
@@ -22,6 +22,8 @@ from cryptography.x509.oid import NameOID
 
 PROXY_CREDENTIALS = "Basic dXNlcjpwYXNz"  # user:pass
 
+PAGE = b"<html><head><title>page</title></head><body>" + b"x" * 1_000_000 + b"</body></html>"
+
 
 def make_self_signed_cert(directory: Path) -> Tuple[Path, Path]:
     """Generate a self-signed certificate for 127.0.0.1."""
@@ -60,13 +62,20 @@ def make_self_signed_cert(directory: Path) -> Tuple[Path, Path]:
 
 
 class EchoHandler(BaseHTTPRequestHandler):
-    """Replies with a JSON dump of the headers it received."""
+    """Replies with a JSON dump of the headers it received.
+
+    ``/page`` serves a large HTML document instead, honouring ``Range: bytes=0-N``.
+    """
 
     protocol_version = "HTTP/1.1"
 
     def do_GET(self) -> None:
+        if self.path.startswith("/page"):
+            return self._send_page()
+
         payload = {
             "path": self.path,
+            "client": self.client_address[0],
             "headers": {name.lower(): value for name, value in self.headers.items()},
         }
         body = json.dumps(payload).encode()
@@ -77,6 +86,25 @@ class EchoHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(body)
 
+    def _send_page(self) -> None:
+        body, status = PAGE, 200
+
+        range_header = self.headers.get("Range")
+        if range_header:
+            last_byte = int(range_header.rpartition("-")[2])
+            body, status = PAGE[: last_byte + 1], 206
+
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            # The client aborted the transfer after reading what it needed
+            pass
+
     def log_message(self, *args) -> None:
         pass
 
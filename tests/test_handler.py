@@ -2,13 +2,14 @@ import json
 
 import pytest
 from curl_cffi import CurlOpt
+from curl_cffi.requests.exceptions import RequestException
 from scrapy.core.downloader.handlers import DownloadHandlers
 from scrapy.http.request import Request
 from scrapy.spiders import Spider
 from scrapy.utils.test import get_crawler
 
 from scrapy_impersonate import ImpersonateDownloadHandler
-from tests.servers import PROXY_CREDENTIALS
+from tests.servers import PAGE, PROXY_CREDENTIALS
 
 
 @pytest.fixture
@@ -123,3 +124,164 @@ class TestProxyAuthorization:
         assert request_through_proxy.headers.get(b"Proxy-Authorization") == (
             PROXY_CREDENTIALS.encode()
         )
+
+
+class TestPartialFetch:
+    async def test_transfer_stops_after_max_bytes(self, handler, http_server):
+        request = Request(
+            f"{http_server.url}/page",
+            meta={"impersonate": "chrome", "impersonate_partial": {"max_bytes": 100}},
+        )
+
+        response = await handler.download_request(request)
+
+        assert response.status == 200
+        assert "partial" in response.flags
+        assert response.body == PAGE[:100]
+        assert response.headers[b"Content-Length"] == b"100"
+
+    async def test_transfer_stops_after_delimiter(self, handler, http_server):
+        request = Request(
+            f"{http_server.url}/page",
+            meta={"impersonate": "chrome", "impersonate_partial": {"delimiter": "</head>"}},
+        )
+
+        response = await handler.download_request(request)
+
+        assert "partial" in response.flags
+        assert response.body == b"<html><head><title>page</title></head>"
+        assert response.css("title::text").get() == "page"
+
+    async def test_range_header_is_sent(self, handler, http_server):
+        request = Request(
+            f"{http_server.url}/page",
+            meta={
+                "impersonate": "chrome",
+                "impersonate_partial": {"max_bytes": 10, "range": True},
+            },
+        )
+
+        response = await handler.download_request(request)
+
+        assert response.status == 206
+        assert "partial" in response.flags
+        assert response.body == PAGE[:10]
+
+    async def test_complete_body_is_not_flagged(self, handler, http_server):
+        request = Request(
+            f"{http_server.url}/hello",
+            meta={"impersonate": "chrome", "impersonate_partial": {"delimiter": "</head>"}},
+        )
+
+        response = await handler.download_request(request)
+
+        assert "partial" not in response.flags
+        assert echoed(response)["path"] == "/hello"
+
+    async def test_delimiter_at_the_end_of_the_body_is_not_flagged(self, handler, http_server):
+        request = Request(
+            f"{http_server.url}/page",
+            meta={"impersonate": "chrome", "impersonate_partial": {"delimiter": "</html>"}},
+        )
+
+        response = await handler.download_request(request)
+
+        assert "partial" not in response.flags
+        assert response.body == PAGE
+
+    async def test_body_of_exactly_max_bytes_is_not_flagged(self, handler, http_server):
+        request = Request(
+            f"{http_server.url}/page",
+            meta={"impersonate": "chrome", "impersonate_partial": {"max_bytes": len(PAGE)}},
+        )
+
+        response = await handler.download_request(request)
+
+        assert "partial" not in response.flags
+        assert response.body == PAGE
+
+    @pytest.mark.parametrize(
+        "partial, message",
+        [
+            ({"max_bytes": 0}, "max_bytes must be a positive integer"),
+            ({"max_bytes": -1}, "max_bytes must be a positive integer"),
+            ({"max_bytes": "100", "range": True}, "max_bytes must be a positive integer"),
+            ({"range": True}, "range requires max_bytes"),
+            ({"delimiter": 1}, "delimiter must be str or bytes"),
+        ],
+    )
+    async def test_invalid_options_are_rejected(self, handler, http_server, partial, message):
+        request = Request(
+            f"{http_server.url}/page",
+            meta={"impersonate": "chrome", "impersonate_partial": partial},
+        )
+
+        with pytest.raises(ValueError, match=message):
+            await handler.download_request(request)
+
+
+async def test_curl_timings_are_recorded(handler, http_server):
+    request = Request(http_server.url, meta={"impersonate": "chrome"})
+
+    response = await handler.download_request(request)
+
+    assert 0 < response.meta["impersonate_connect_time"] <= response.meta["impersonate_ttfb"]
+    assert response.meta["impersonate_ttfb"] <= response.meta["download_latency"]
+
+
+class TestInterfaceRotation:
+    @pytest.fixture
+    def make_handler(self):
+        def make_handler(**settings):
+            settings.setdefault("IMPERSONATE_INTERFACES", ["127.0.0.1", "127.0.0.2"])
+            return ImpersonateDownloadHandler.from_crawler(get_crawler(settings_dict=settings))
+
+        return make_handler
+
+    async def test_interfaces_are_rotated(self, make_handler, http_server):
+        handler = make_handler()
+        clients = []
+        for _ in range(4):
+            request = Request(http_server.url, meta={"impersonate": "chrome"})
+            response = await handler.download_request(request)
+            clients.append(echoed(response)["client"])
+
+        assert clients == ["127.0.0.1", "127.0.0.2", "127.0.0.1", "127.0.0.2"]
+        assert handler.stats.get_value("impersonate/interface/127.0.0.1/request_count") == 2
+        assert handler.stats.get_value("impersonate/interface/127.0.0.2/request_count") == 2
+
+    def test_interfaces_stick_to_domains(self, make_handler):
+        handler = make_handler(IMPERSONATE_INTERFACES_STICKY=True)
+
+        def interface(url):
+            return handler._get_interface(Request(url))
+
+        assert interface("https://a.example") == interface("https://a.example/page")
+        assert interface("https://a.example") == make_handler(
+            IMPERSONATE_INTERFACES_STICKY=True
+        )._get_interface(Request("https://a.example"))
+        assert {interface(f"https://{name}.example") for name in "abcdefgh"} == {
+            "127.0.0.1",
+            "127.0.0.2",
+        }
+
+    async def test_explicit_interface_takes_precedence(self, make_handler, http_server):
+        handler = make_handler()
+        request = Request(
+            http_server.url,
+            meta={"impersonate": "chrome", "impersonate_args": {"interface": "127.0.0.3"}},
+        )
+
+        response = await handler.download_request(request)
+
+        assert echoed(response)["client"] == "127.0.0.3"
+
+    async def test_errors_are_counted(self, make_handler, http_server):
+        handler = make_handler(IMPERSONATE_INTERFACES=["127.0.0.1"])
+        url = http_server.url
+        http_server.stop()
+
+        with pytest.raises(RequestException):
+            await handler.download_request(Request(url, meta={"impersonate": "chrome"}))
+
+        assert handler.stats.get_value("impersonate/interface/127.0.0.1/error_count") == 1
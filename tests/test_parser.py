@@ -139,3 +139,29 @@ class TestRequestParser:
 
         assert request_args["timeout"] == 5
         assert request_args["verify"] is False
+
+    def test_partial_range_header(self):
+        request = make_request(
+            meta={
+                "impersonate": "chrome",
+                "impersonate_partial": {"max_bytes": 1024, "range": True},
+            }
+        )
+
+        assert RequestParser(request).as_dict()["headers"]["Range"] == "bytes=0-1023"
+
+    def test_explicit_range_header_is_kept(self):
+        request = make_request(
+            meta={
+                "impersonate": "chrome",
+                "impersonate_partial": {"max_bytes": 1024, "range": True},
+            },
+            headers={"Range": "bytes=0-99"},
+        )
+
+        assert RequestParser(request).as_dict()["headers"]["Range"] == "bytes=0-99"
+
+    def test_partial_none_is_ignored(self):
+        request = make_request(meta={"impersonate": "chrome", "impersonate_partial": None})
+
+        assert "Range" not in RequestParser(request).as_dict()["headers"]
@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+
+import pytest
+from scrapy.http.request import Request
+from scrapy.http.response import Response
+from scrapy.utils.test import get_crawler
+
+from scrapy_impersonate import ImpersonateAutoThrottle
+
+
+@pytest.fixture
+def slot():
+    return SimpleNamespace(concurrency=8, delay=1.0)
+
+
+@pytest.fixture
+def throttle(slot):
+    crawler = get_crawler(
+        settings_dict={
+            "AUTOTHROTTLE_ENABLED": True,
+            "AUTOTHROTTLE_TARGET_CONCURRENCY": 1.0,
+            "AUTOTHROTTLE_START_DELAY": 5.0,
+            "AUTOTHROTTLE_MAX_DELAY": 60.0,
+        }
+    )
+    throttle = ImpersonateAutoThrottle.from_crawler(crawler)
+    throttle.mindelay, throttle.maxdelay = 0.0, 60.0
+    crawler.engine = SimpleNamespace(downloader=SimpleNamespace(slots={"example.org": slot}))
+    return throttle
+
+
+def make_response(status=200, headers=None, **meta) -> Response:
+    request = Request("https://example.org", meta={"download_slot": "example.org", **meta})
+    return Response(request.url, status=status, headers=headers, request=request)
+
+
+class TestServerLatency:
+    def test_connection_setup_is_left_out(self, throttle, slot):
+        response = make_response(impersonate_connect_time=3.0, impersonate_ttfb=3.2)
+
+        throttle._adjust_delay(slot, 10.0, response)
+
+        assert slot.delay == pytest.approx(0.6)
+
+    def test_download_latency_is_used_without_curl_timings(self, throttle, slot):
+        throttle._adjust_delay(slot, 3.0, make_response())
+
+        assert slot.delay == pytest.approx(3.0)
+
+
+class TestBackOff:
+    def test_too_many_requests(self, throttle, slot):
+        throttle._adjust_delay(slot, 0.1, make_response(status=429))
+
+        assert slot.delay == 5.0
+        assert slot.concurrency == 4
+
+    def test_delay_is_doubled(self, throttle, slot):
+        slot.delay = 8.0
+
+        throttle._adjust_delay(slot, 0.1, make_response(status=429))
+
+        assert slot.delay == 16.0
+
+    @pytest.mark.parametrize("retry_after", ["30", "Wed, 21 Oct 2099 07:28:00 GMT"])
+    def test_retry_after_is_honoured_up_to_the_max_delay(self, throttle, slot, retry_after):
+        response = make_response(status=503, headers={"Retry-After": retry_after})
+
+        throttle._adjust_delay(slot, 0.1, response)
+
+        assert slot.delay >= 30.0
+        assert slot.delay <= 60.0
+
+    def test_overridden_start_delay_is_applied(self, throttle, slot):
+        throttle._start_delay = lambda *args: 7.0
+
+        throttle._adjust_delay(slot, 0.1, make_response(status=429))
+
+        assert slot.delay == 7.0
+
+    def test_burst_of_rate_limited_responses_backs_off_once(self, throttle, slot):
+        slot.concurrency = 16
+        for _ in range(8):
+            throttle._adjust_delay(slot, 0.5, make_response(status=429, download_latency=0.5))
+
+        assert slot.delay == 5.0
+        assert slot.concurrency == 8
+
+    def test_requests_sent_after_the_back_off_back_off_again(self, throttle, slot):
+        throttle._adjust_delay(slot, 0.1, make_response(status=429))
+        throttle._backoffs["example.org"].backed_off_at -= 10
+
+        throttle._adjust_delay(slot, 0.1, make_response(status=429, download_latency=0.1))
+
+        assert slot.delay == 10.0
+        assert slot.concurrency == 2
+
+    @pytest.mark.parametrize("status", [200, 301])
+    def test_retry_after_is_ignored_unless_rate_limited(self, throttle, slot, status):
+        throttle._adjust_delay(slot, 0.1, make_response(status, headers={"Retry-After": "1"}))
+
+        assert slot.delay < 5.0
+        assert slot.concurrency == 8
+
+    def test_retry_after_is_held_through_successful_responses(self, throttle, slot):
+        throttle._adjust_delay(slot, 0.1, make_response(status=429, headers={"Retry-After": "30"}))
+        for _ in range(4):
+            throttle._adjust_delay(slot, 0.1, make_response())
+
+        assert slot.delay == 30.0
+        assert slot.concurrency == 4
+
+    def test_concurrency_grows_back_once_the_hold_is_over(self, throttle, slot):
+        throttle._adjust_delay(slot, 0.1, make_response(status=429))
+        throttle._backoffs["example.org"].hold_until = 0.0
+        for _ in range(10):
+            throttle._adjust_delay(slot, 0.1, make_response())
+
+        assert slot.concurrency == 8
+        assert slot.delay < 5.0
+
+
+class TestBackOffState:
+    def test_slots_that_never_back_off_have_no_state(self, throttle, slot):
+        throttle._adjust_delay(slot, 0.1, make_response())
+
+        assert throttle._backoffs == {}
+
+    def test_recovered_slot_leaves_no_state(self, throttle, slot):
+        throttle._adjust_delay(slot, 0.1, make_response(status=429))
+        throttle._backoffs["example.org"].hold_until = 0.0
+        for _ in range(4):
+            throttle._adjust_delay(slot, 0.1, make_response())
+
+        assert slot.concurrency == 8
+        assert throttle._backoffs == {}
+
+    def test_rebuilt_slot_does_not_inherit_the_back_off(self, throttle, slot):
+        throttle._adjust_delay(slot, 0.1, make_response(status=429))
+        new_slot = SimpleNamespace(concurrency=8, delay=1.0)
+        throttle.crawler.engine.downloader.slots["example.org"] = new_slot
+
+        throttle._adjust_delay(new_slot, 0.1, make_response())
+
+        assert new_slot.delay < 1.0
+        assert throttle._backoffs == {}
+
+    def test_dropped_slots_are_pruned_on_back_off(self, throttle, slot):
+        throttle._adjust_delay(slot, 0.1, make_response(status=429))
+        del throttle.crawler.engine.downloader.slots["example.org"]
+        other = SimpleNamespace(concurrency=8, delay=1.0)
+        throttle.crawler.engine.downloader.slots["other.org"] = other
+
+        throttle._adjust_delay(other, 0.1, make_response(status=429, download_slot="other.org"))
+
+        assert list(throttle._backoffs) == ["other.org"]